@@ -1,6 +1,55 @@
+import os
+import threading
+from collections import OrderedDict
 from hangman_v3 import *
 from flask import Flask, request, jsonify
 
+# --- Candidate cache ---
+# Surviving bucket rows per game state (pattern, guessed letters). A turn refines the survivors
+# of the previous turn of its game instead of re-filtering the whole bucket.
+KEEP_CACHE_SIZE = 4096
+keep_cache = OrderedDict()
+keep_cache_lock = threading.Lock()
+
+
+def lookup_keep(pattern: str, guessed: set):
+    """
+    Find cached survivors for this game state or for the state one guess earlier.
+
+    Args:
+        pattern (str): Current pattern of the word without spaces.
+        guessed (set): Letters already guessed.
+
+    Returns:
+        np.ndarray | None: Bucket row indices to refine, or None on a cache miss.
+    """
+    # undoing a guess hides its letter in the pattern again and drops it from the guessed set
+    keys = [(pattern, frozenset(guessed))]
+    keys += [(pattern.replace(g, "_"), frozenset(guessed - {g})) for g in guessed]
+    with keep_cache_lock:
+        for key in keys:
+            if key in keep_cache:
+                keep_cache.move_to_end(key)
+                return keep_cache[key]
+    return None
+
+
+def store_keep(pattern: str, guessed: set, keep):
+    """
+    Remember the survivors of a game state, evicting the least recently used states.
+
+    Args:
+        pattern (str): Current pattern of the word without spaces.
+        guessed (set): Letters already guessed.
+        keep (np.ndarray): Bucket row indices of the candidates.
+    """
+    key = (pattern, frozenset(guessed))
+    with keep_cache_lock:
+        keep_cache[key] = keep
+        keep_cache.move_to_end(key)
+        while len(keep_cache) > KEEP_CACHE_SIZE:
+            keep_cache.popitem(last=False)
+
 
 def get_best_guess(current_word_state: str, guessed_letters: list) -> str:
     """
@@ -18,22 +67,48 @@ def get_best_guess(current_word_state: str, guessed_letters: list) -> str:
         str: The next guessed letter.
     """
     guess = None
-    guessed = set(guessed_letters)
+    # the index only holds lowercase a-z, so normalize the request and drop any other guessed characters
+    guessed = {g for g in (str(g).lower() for g in guessed_letters) if len(g) == 1 and "a" <= g <= "z"}
     print(f"GUESSED: {guessed}")
-    pattern = current_word_state.replace(" ", "")
+    pattern = current_word_state.lower().replace(" ", "")
     print(f"PATTERN: {pattern}")
     wrong_guesses = set(guessed) - set(pattern) - set('_')
     print(f"WRONG GUESSES: {wrong_guesses}")
-    candidates = filter_candidates(words, pattern, wrong_guesses)
-    if candidates:
-        guess = entropy_guess(candidates, guessed, weight_freq=0.5)
-    else:
-        guess = bayesian_guess(pattern, guessed, unigram_probs, bigram, trigram,
-                               bigram_next_sum, bigram_prev_sum, trigram_lr_sum)
-        if guess is None:
-            guess = fallback_unigram(unigram_probs, guessed)
+    guessed_mask = letter_mask(guessed)
+
+    # the API plays the combo strategy, so its guesses are cached under that name
+    state = guess_state(pattern, guessed_mask, "combo", 0.5)
+    guess = lookup_guess(state)
+    if guess is None:
+        keep = lookup_keep(pattern, guessed)
+        cand_matrix, cand_letter_sets, keep = filter_candidates(word_index, pattern, wrong_guesses, keep)
+        store_keep(pattern, guessed, keep)
+        if len(cand_matrix):
+            guess = entropy_guess(cand_matrix, cand_letter_sets, guessed_mask, weight_freq=0.5)
+        else:
+            guess = bayesian_guess(pattern, guessed_mask, log_prior, log_pLX, log_pRX, log_pLXR)
+            if guess is None:
+                guess = fallback_unigram(unigram_probs, guessed_mask)
+        store_guess(state, guess)
+
+    return chr(97 + guess) if guess is not None else None
+
+
+# --- Corpus ---
+# Loaded at import time so `gunicorn --preload` builds it once in the master process and workers share it
+# through fork (the word buckets are memory-mapped, so copy-on-write never duplicates them). The parallel
+# kernel must not start its threads before that fork, so it is warmed up per worker (see gunicorn.conf.py).
+# Set HANGMAN_SKIP_CORPUS=1 to import the module without loading a corpus, e.g. in tests.
+if not os.environ.get("HANGMAN_SKIP_CORPUS"):
+    corpus_list = ["corpus/word_corpus.txt", "corpus/airline_corpus.txt"]
 
-    return guess
+    # Load the word index and n-gram stats, rebuilt only when the corpus files change
+    word_index, ngram_stats = load_corpus(corpus_list)
+    print(f"{sum(len(matrix) for matrix, _ in word_index.values())} words in the corpus")
+    unigram_probs, bigram, trigram, bigram_next_sum, bigram_prev_sum, trigram_lr_sum = ngram_stats
+    log_prior, log_pLX, log_pRX, log_pLXR = build_bayes_tables(unigram_probs, bigram, trigram,
+                                                               bigram_next_sum, trigram_lr_sum)
+    warm_up_kernels(parallel=False)
 
 
 # --- Flask API ---
@@ -67,17 +142,9 @@ def play():
 
 
 if __name__ == '__main__':
+    # The dev server never forks (the reloader starts the app in a fresh subprocess), so the parallel
+    # kernel can be warmed up here too
+    if not os.environ.get("HANGMAN_SKIP_CORPUS"):
+        warm_up_kernels()
     # Run Flask app in debug mode (auto-reload and detailed errors)
-
-    corpus_list = ["corpus/word_corpus.txt", "corpus/airline_corpus.txt"]
-    words = []
-    for file_name in corpus_list:
-        words += read_words(file_name)
-        print(f"{len(words)} words in the corpus")
-
-    if not words:
-        raise RuntimeError("No words available?!")
-
-    # Build n-gram stats for Bayesian strategy
-    unigram_probs, bigram, trigram, bigram_next_sum, bigram_prev_sum, trigram_lr_sum = build_ngram_stats(words)
     app.run(debug=True)
@@ -4,6 +4,8 @@ import nltk
 import time
 import random
 import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from bs4 import BeautifulSoup
 
 # Download words corpus if not already downloaded
@@ -38,8 +40,14 @@ def read_words(filename: str) -> list:
     """
     word_list = []
     if os.path.exists(filename):
-        with open(filename) as file:
-            word_list = [w.strip().lower() for w in file if w.strip().isalpha()]
+        with open(filename, "rb") as file:
+            data = file.read().lower()
+        if data.replace(b"\n", b"").isalpha():
+            # fast path for clean corpus files (one ASCII word per line): validate and split in C
+            word_list = data.decode("ascii").split()
+        else:
+            lines = data.decode("utf-8").lower().splitlines()
+            word_list = [w.strip() for w in lines if w.strip().isalpha()]
     return word_list
 
 
@@ -89,17 +97,17 @@ def create_airline_corpus(wikipedia_dump_file: str, airline_corpus_file: str):
 
 # # # # # # # # # # # # # # # # # # Wikipedia Scraping # # # # # # # # # # # # # # # # # #
 
-def wiki_scraper_recursive(link: str, wiki_dump_filename: str):
+def wiki_scraper_recursive(link: str, wiki_dump_filename: str, max_depth: int = 3, max_workers: int = 8):
     """
-    Recursively scrape Wikipedia pages starting from a given link and save content.
+    Crawl Wikipedia pages breadth-first from a given link, following article links up to max_depth,
+    and save their content. Pages are fetched concurrently by a bounded pool of worker threads.
 
     Args:
         link (str): Starting Wikipedia URL.
         wiki_dump_filename (str): Output file where scraped text will be appended.
+        max_depth (int, optional): Maximum link depth to follow from the start page. Defaults to 3.
+        max_workers (int, optional): Number of pages fetched in parallel. Defaults to 8.
     """
-    # Global settings
-    visited = set()  # To avoid revisiting pages
-
     # Headers to avoid 403 errors
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -107,41 +115,51 @@ def wiki_scraper_recursive(link: str, wiki_dump_filename: str):
                       "Chrome/122.0.0.0 Safari/537.36"
     }
 
-    def scrape_wiki(url, depth=0, max_depth=1):
-        """Recursively scrape Wikipedia pages up to max_depth."""
-        if depth > max_depth or url in visited:
-            return
-
-        visited.add(url)
-
-        try:
-            # Random sleep to avoid hammering Wikipedia
-            sleep_time = random.randint(1, 3)
-            time.sleep(sleep_time)
-
-            # Fetch page
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            # Extract text and append to text file
-            page_text = soup.get_text()
-            with open(wiki_dump_filename, "a", encoding="utf-8") as f:
+    def fetch_page(url):
+        """Fetch and parse a single page (runs in a worker thread)."""
+        # Random sleep per worker to avoid hammering Wikipedia
+        time.sleep(random.uniform(1, 3))
+        response = requests.get(url, headers=headers, timeout=30)
+        response.raise_for_status()
+        return BeautifulSoup(response.text, "html.parser")
+
+    visited = {link}  # pages already queued, to avoid revisiting them
+    queue = deque([(link, 0)])
+    pending = {}  # in-flight fetches: future -> (url, depth)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor, \
+            open(wiki_dump_filename, "a", encoding="utf-8") as f:
+        while queue or pending:
+            # keep the pool busy without queueing the whole frontier as futures
+            while queue and len(pending) < 2 * max_workers:
+                url, depth = queue.popleft()
+                pending[executor.submit(fetch_page, url)] = (url, depth)
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                url, depth = pending.pop(future)
+                try:
+                    soup = future.result()
+                except Exception as e:
+                    print(f"Failed to scrape {url}: {e}")
+                    continue
+
+                # Extract text and append to text file (only this thread writes, so pages never interleave)
+                page_text = soup.get_text()
                 f.write(f"\n\n--- Page: {url} (Depth {depth}) ---\n\n")
                 f.write(replacer(page_text.replace('\n', ' ')))
 
-            # Extract Wikipedia links and recurse
-            for link in soup.find_all("a", href=True):
-                href = link["href"]
-                if href.startswith("/wiki/") and not href.startswith("/wiki/Special:"):
-                    next_url = "https://en.wikipedia.org" + href
-                    scrape_wiki(next_url, depth + 1, max_depth)
-                    print(f"{next_url} done")
-
-        except Exception as e:
-            print(f"Failed to scrape {url}: {e}")
+                # Queue unseen Wikipedia links one level deeper
+                if depth < max_depth:
+                    for a in soup.find_all("a", href=True):
+                        href = a["href"]
+                        if href.startswith("/wiki/") and not href.startswith("/wiki/Special:"):
+                            next_url = "https://en.wikipedia.org" + href
+                            if next_url not in visited:
+                                visited.add(next_url)
+                                queue.append((next_url, depth + 1))
+                print(f"{url} done")
 
-    scrape_wiki(link, depth=0, max_depth=3)
     print("Scraping complete. Output saved to", wiki_dump_filename)
 
 
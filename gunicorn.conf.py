@@ -0,0 +1,12 @@
+"""
+Gunicorn settings for serving app:app, picked up automatically when gunicorn is started from this directory.
+"""
+from hangman_v3 import warm_up_kernels
+
+
+def post_fork(server, worker):
+    """
+    Warm up the parallel entropy kernel in each worker. The preloaded master only warms the serial
+    kernel, because starting Numba's thread pool before forking is unsafe.
+    """
+    warm_up_kernels()
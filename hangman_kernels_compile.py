@@ -0,0 +1,36 @@
+"""
+Ahead-of-time compile the hot Numba kernels of hangman_v3 into the `hangman_kernels` extension module.
+
+hangman_v3 imports the compiled kernels when the extension is present and was built from its current
+kernel sources, so Flask reloads and forked workers never pay JIT compilation on their first request.
+Rebuild after changing a kernel:
+
+    python hangman_kernels_compile.py
+"""
+import os
+import sys
+from numba.pycc import CC
+
+# make hangman_v3 keep its JIT kernels (and their Python sources) even if an older build exists
+sys.modules["hangman_kernels"] = None
+import hangman_v3
+
+cc = CC("hangman_kernels")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc.export("entropy_kernel", "Tuple((f8[:], f8[:]))(u1[:, :], i8)")(hangman_v3.entropy_kernel.py_func)
+cc.export("count_ngrams", "void(u1[:], i8[:], i8[:, :], i8[:, :, :])")(hangman_v3.count_ngrams.py_func)
+cc.export("letter_set_masks", "u4[:](u1[:, :])")(hangman_v3.letter_set_masks.py_func)
+
+# hangman_v3 only uses the build while this matches the hash of its current kernel sources
+KERNELS_VERSION = hangman_v3.kernels_source_hash()
+
+
+def kernels_version():
+    return KERNELS_VERSION
+
+
+cc.export("kernels_version", "i8()")(kernels_version)
+
+if __name__ == "__main__":
+    cc.compile()
@@ -1,265 +1,727 @@
-import math
+import os
 import time
 import json
 import random
-import pandas as pd
-from collections import Counter, defaultdict
+import shutil
+import hashlib
+import inspect
+import tempfile
+import warnings
+import threading
+import numpy as np
+from numba import config, njit, prange
+from collections import OrderedDict, defaultdict
 from create_corpus import read_words
 
 
+# # # # # # # # # # # # # # # # # # Word Index # # # # # # # # # # # # # # # # # #
+
+ALPHABET = np.arange(26, dtype=np.uint8)  # letter codes, 0 = 'a'
+ALL_LETTERS = (1 << 26) - 1  # mask with every letter set
+
+
+def letter_mask(letters) -> int:
+    """
+    Pack letters into a 26-bit mask where bit b is set for letter chr(97 + b).
+
+    Args:
+        letters (iterable): Lowercase letters; anything outside a-z is ignored.
+
+    Returns:
+        int: Bitmask of the given letters.
+    """
+    mask = 0
+    for c in letters:
+        if "a" <= c <= "z" and len(c) == 1:
+            mask |= 1 << (ord(c) - 97)
+    return mask
+
+
+def unguessed(guessed_mask: int) -> np.ndarray:
+    """
+    Flag the letters missing from a guessed-letter mask.
+
+    Args:
+        guessed_mask (int): Bitmask of letters already guessed.
+
+    Returns:
+        np.ndarray: Boolean vector indexed by letter code, True for letters not yet guessed.
+    """
+    return (np.uint32(guessed_mask) >> ALPHABET) & 1 == 0
+
+
+def is_index_word(word: str) -> bool:
+    """
+    Check that a word only holds the letters a-z, the only characters the kernels can encode.
+
+    Args:
+        word (str): Word to check.
+
+    Returns:
+        bool: True if every character of the word is a lowercase ASCII letter.
+    """
+    return word.isascii() and word.isalpha() and word.islower()
+
+
+@njit(cache=True)
+def letter_set_masks(matrix):
+    """
+    OR each row's letters into its 26-bit letter-set mask in one pass over the uint8 matrix,
+    without materializing an (N, length) array of shifted bits.
+    """
+    masks = np.empty(matrix.shape[0], dtype=np.uint32)
+    for r in range(matrix.shape[0]):
+        mask = 0
+        for j in range(matrix.shape[1]):
+            mask |= 1 << (matrix[r, j] - 97)
+        masks[r] = mask
+    return masks
+
+
+def build_word_index(words: list) -> dict:
+    """
+    Group words by length into contiguous uint8 matrices for vectorized candidate filtering.
+
+    Args:
+        words (list): List of lowercase alphabetic words; words with characters outside a-z are skipped.
+
+    Returns:
+        dict: {length: (matrix, letter_sets)} where matrix is an (N, length) uint8 array of
+              character codes and letter_sets holds the 26-bit letter-set mask of each word (uint32).
+    """
+    global corpus_epoch
+    corpus_epoch += 1
+
+    groups = defaultdict(list)
+    for word in words:
+        if word.isascii():  # one byte per letter keeps the rows fixed-width
+            groups[len(word)].append(word)
+
+    word_index = {}
+    for length, group in groups.items():
+        data = "".join(group).encode()
+        if not (data.isalpha() and data.islower()):
+            # only a-z fits the 26-bit letter sets; checking the joined bucket keeps clean corpora cheap
+            group = [word for word in group if is_index_word(word)]
+            if not group:
+                continue
+            data = "".join(group).encode()
+        matrix = np.frombuffer(data, dtype=np.uint8).reshape(-1, length)
+        word_index[length] = (matrix, letter_set_masks(matrix))
+    return word_index
+
+
 # # # # # # # # # # # # # # # # # # Candidate Filtering # # # # # # # # # # # # # # # # # #
 
-def filter_candidates(word_list: list, pattern: str, wrong_guesses: list) -> list:
+def filter_candidates(word_index: dict, pattern, wrong_guesses, keep=None) -> tuple:
     """
-    Filter the word list to include only candidates matching the current pattern
+    Filter the word index to include only candidates matching the current pattern
     and excluding any letters already guessed incorrectly.
 
     Args:
-        word_list (list): List of all possible words.
+        word_index (dict): Length-bucketed word index from build_word_index.
         pattern (str): Current pattern of the word (e.g., "_ p p _ e").
-        wrong_guesses (list): List of letters guessed incorrectly.
+        wrong_guesses (set): Letters guessed incorrectly.
+        keep (np.ndarray, optional): Surviving row indices from an earlier turn of the same game.
+            Constraints only ever tighten, so only these rows are checked.
+
+    Returns:
+        tuple: (cand_matrix, cand_letter_sets, keep) - uint8 rows, letter-set masks and bucket row
+               indices of the valid candidates for next guess.
+    """
+    bucket = word_index.get(len(pattern))  # only words of the pattern's length are ever scanned
+    if bucket is None:
+        return np.empty((0, len(pattern)), dtype=np.uint8), np.empty(0, dtype=np.uint32), np.empty(0, dtype=np.intp)
+    matrix, letter_sets = bucket
+    # rows are gathered by index throughout: take() is several times faster than a boolean mask on 2-D arrays
+    if keep is not None:
+        matrix, letter_sets = matrix.take(keep, axis=0), letter_sets.take(keep)
+
+    # wrongly guessed letters shouldn't be present in candidates: one AND against the letter sets
+    # covers every blank position, so the matrix is only scanned for the known letters
+    ok = (letter_sets & letter_mask(wrong_guesses)) == 0
+    for i, p in enumerate(pattern):
+        if p != "_":  # known letters should match for valid candidates
+            ok &= matrix[:, i] == ord(p)
+
+    rows = np.flatnonzero(ok)
+    keep = rows if keep is None else keep.take(rows)
+    return matrix.take(rows, axis=0), letter_sets.take(rows), keep
+
+
+# # # # # # # # # # # # # # # # # # Guess Cache # # # # # # # # # # # # # # # # # #
+
+# Identical game states recur across games (every game of a given length opens the same way),
+# so guesses of deterministic strategies are memoized per state in a bounded LRU.
+GUESS_CACHE_SIZE = 100_000
+guess_cache = OrderedDict()
+guess_cache_lock = threading.Lock()
+corpus_epoch = 0  # bumped whenever corpus data is (re)built, so cached guesses never outlive their corpus
+
+
+def guess_state(pattern, guessed_mask: int, strategy: str, weight_freq: float) -> tuple:
+    """
+    Build the guess cache key of a game state.
+
+    Args:
+        pattern (list): Current word pattern.
+        guessed_mask (int): Bitmask of letters already guessed.
+        strategy (str): Strategy choosing the guess.
+        weight_freq (float): Weight for frequency in entropy-based strategies.
 
     Returns:
-        list: Words that are valid candidates for next guess.
+        tuple: Hashable key, tagged with the current corpus epoch.
     """
+    return tuple(pattern), guessed_mask, strategy, weight_freq, corpus_epoch
 
-    def matches(word: str):
-        if len(word) != len(pattern):
-            return False
-        for i, p in enumerate(pattern):
-            if p != "_" and word[i] != p:  # known letters should match for valid candidates
-                return False
-            if p == "_" and word[i] in wrong_guesses:  # wrongly guessed letters shouldn't be present in candidates
-                return False
-        return True
 
-    return [w for w in word_list if matches(w)]
+def lookup_guess(state: tuple):
+    """
+    Fetch the cached guess of a game state.
+
+    Args:
+        state (tuple): Key from guess_state.
+
+    Returns:
+        int | None: Cached letter code, or None on a cache miss.
+    """
+    with guess_cache_lock:
+        if state in guess_cache:
+            guess_cache.move_to_end(state)
+            return guess_cache[state]
+    return None
+
+
+def store_guess(state: tuple, guess):
+    """
+    Remember the guess of a game state, evicting the least recently used states.
+
+    Args:
+        state (tuple): Key from guess_state.
+        guess (int): Letter code chosen for the state.
+    """
+    with guess_cache_lock:
+        guess_cache[state] = guess
+        guess_cache.move_to_end(state)
+        while len(guess_cache) > GUESS_CACHE_SIZE:
+            guess_cache.popitem(last=False)
 
 
 # # # # # # # # # # # # # # # # # #  Build n-gram statistics  # # # # # # # # # # # # # # # # # #
 
+@njit(cache=True)
+def count_ngrams(buf, uni, bi, tri):
+    """
+    Accumulate unigram, bigram and trigram counts over a buffer of letter codes in a single pass.
+    Code 26 marks word boundaries, so n-grams spanning two words land outside the letter block.
+    """
+    for i in range(buf.shape[0]):
+        c = buf[i]
+        uni[c] += 1
+        if i > 0:
+            bi[buf[i - 1], c] += 1
+        if i > 1:
+            tri[buf[i - 2], buf[i - 1], c] += 1
+
+
 def build_ngram_stats(words: list) -> tuple:
     """
     Build unigram, bigram, and trigram frequency statistics from a word list.
 
     Args:
-        words (list): List of words.
+        words (list): List of words; words with characters outside a-z are skipped.
 
     Returns:
         tuple: (unigram_probs, bigram, trigram, bigram_next_sum, bigram_prev_sum, trigram_lr_sum)
+               as NumPy arrays indexed by letter (0 = 'a').
     """
-    unigram = Counter()
-    bigram = Counter()
-    trigram = Counter()
-
-    for word in words:
-        for i, c in enumerate(word):
-            unigram[c] += 1
-            if i > 0:
-                bigram[(word[i - 1], c)] += 1
-            if i > 1:
-                trigram[(word[i - 2], word[i - 1], c)] += 1
-
-    total = sum(unigram.values()) if unigram else 1
-    unigram_probs = {c: unigram[c] / total for c in unigram}
+    global corpus_epoch
+    corpus_epoch += 1
+
+    # '{' follows 'z' in ASCII, so it encodes to the boundary code 26; any other character would
+    # index outside the count tables, so only a-z words are counted (checked on the joined buffer first)
+    data = ("{" + "{".join(words) + "{").encode()
+    if not (all(words) and data.count(b"{") == len(words) + 1
+            and data.replace(b"{", b"").isalpha() and data.islower()):
+        data = ("{" + "{".join(w for w in words if is_index_word(w)) + "{").encode()
+    buf = np.frombuffer(data, dtype=np.uint8) - 97
+
+    uni = np.zeros(27, dtype=np.int64)
+    bi = np.zeros((27, 27), dtype=np.int64)
+    tri = np.zeros((27, 27, 27), dtype=np.int64)
+    count_ngrams(buf, uni, bi, tri)
+    unigram, bigram, trigram = uni[:26], bi[:26, :26], tri[:26, :26, :26]
+
+    total = unigram.sum() or 1
+    unigram_probs = unigram / total
 
     # Precompute sums needed for conditional probabilities and smoothing
-    bigram_next_sum = defaultdict(int)  # sum over next letters given previous
-    bigram_prev_sum = defaultdict(int)  # sum over previous letters given next
-    for (a, b), v in bigram.items():
-        bigram_next_sum[a] += v
-        bigram_prev_sum[b] += v
+    bigram_next_sum = bigram.sum(axis=1)  # sum over next letters given previous
+    bigram_prev_sum = bigram.sum(axis=0)  # sum over previous letters given next
 
     # Trigram sum for smoothing
-    trigram_lr_sum = defaultdict(int)
-    for (a, b, c), v in trigram.items():
-        trigram_lr_sum[(a, c)] += v
+    trigram_lr_sum = trigram.sum(axis=1)
 
     return unigram_probs, bigram, trigram, bigram_next_sum, bigram_prev_sum, trigram_lr_sum
 
 
+def build_bayes_tables(unigram_probs, bigram, trigram, bigram_next_sum, trigram_lr_sum, alpha=1.0) -> tuple:
+    """
+    Bake the Laplace-smoothed n-gram probabilities used by bayesian_guess into dense log tables.
+
+    Args:
+        unigram_probs, bigram, trigram: N-gram statistics from build_ngram_stats.
+        bigram_next_sum, trigram_lr_sum: Precomputed sums from build_ngram_stats.
+        alpha (float): Laplace smoothing parameter.
+
+    Returns:
+        tuple: (log_prior, log_pLX, log_pRX, log_pLXR) indexed by letter (0 = 'a') as
+               log_prior[X], log_pLX[left, X], log_pRX[right, X] and log_pLXR[left, right, X].
+    """
+    V = 26  # alphabet size for smoothing
+
+    log_prior = np.log(np.where(unigram_probs > 0, unigram_probs, 1e-12))
+    # P(left | X) ~ count(left,X) / sum_a count(a,X)
+    log_pLX = np.log((bigram + alpha) / (bigram_next_sum[:, None] + alpha * V))
+    # P(right | X) ~ count(X,right) / sum_b count(X,b), same ratio stored by right letter for contiguous rows
+    log_pRX = np.ascontiguousarray(log_pLX.T)
+    # trigram factor (how likely is X to appear between left and right)
+    log_pLXR = np.log((trigram + alpha) / (trigram_lr_sum[:, None, :] + alpha * V))
+    log_pLXR = np.ascontiguousarray(log_pLXR.transpose(0, 2, 1))
+    return log_prior, log_pLX, log_pRX, log_pLXR
+
+
+# # # # # # # # # # # # # # # # # # Index Persistence # # # # # # # # # # # # # # # # # #
+
+NGRAM_NAMES = ("unigram_probs", "bigram", "trigram", "bigram_next_sum", "bigram_prev_sum", "trigram_lr_sum")
+INDEX_VERSION = 2  # bump whenever the persisted layout or word filtering changes, so stale indexes are never reused
+
+
+def corpus_digest(file_names: list) -> str:
+    """
+    Compute a content hash of the corpus files, used to key the persisted index.
+
+    Args:
+        file_names (list): Paths of the corpus files.
+
+    Returns:
+        str: Hex SHA-1 digest over the index format version and the file contents, in order.
+    """
+    digest = hashlib.sha1(f"index v{INDEX_VERSION}\0".encode())
+    for file_name in file_names:
+        with open(file_name, "rb") as f:
+            digest.update(f.read())
+        digest.update(b"\0")  # keep file boundaries significant
+    return digest.hexdigest()
+
+
+def persist_index(words: list, path: str):
+    """
+    Build the word index and n-gram statistics for a word list and save them to a directory.
+
+    Each length bucket is stored as its own .npy pair so it can be memory-mapped on load, and
+    the n-gram statistics go to ngrams.npz. Everything is written to a temporary directory next
+    to path that is renamed into place at the end, so path only ever holds a complete index even
+    if the build is killed or several processes build at once.
+
+    Args:
+        words (list): List of words.
+        path (str): Output directory.
+    """
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(prefix=".build-", dir=parent)
+    try:
+        for length, (matrix, letter_sets) in build_word_index(words).items():
+            np.save(os.path.join(tmp_path, f"matrix_{length}.npy"), matrix)
+            np.save(os.path.join(tmp_path, f"letter_sets_{length}.npy"), letter_sets)
+        np.savez(os.path.join(tmp_path, "ngrams.npz"), **dict(zip(NGRAM_NAMES, build_ngram_stats(words))))
+        # mkdtemp creates the directory as 0700; give it the umask-derived mode makedirs would have used,
+        # so processes running as another user (e.g. gunicorn workers) can still read the index
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o777 & ~umask)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            if not os.path.isdir(path):
+                raise
+            # another process finished the same index first, keep its copy
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def load_index(path: str) -> tuple:
+    """
+    Load a word index and n-gram statistics saved by persist_index.
+
+    Word buckets are memory-mapped read-only, so they are paged in on demand and shared
+    between processes serving the same corpus.
+
+    Args:
+        path (str): Directory written by persist_index.
+
+    Returns:
+        tuple: (word_index, ngram_stats) with ngram_stats laid out as returned by build_ngram_stats.
+    """
+    global corpus_epoch
+    corpus_epoch += 1
+
+    word_index = {}
+    for file_name in os.listdir(path):
+        if file_name.startswith("matrix_"):
+            length = int(file_name[len("matrix_"):-len(".npy")])
+            word_index[length] = (np.load(os.path.join(path, file_name), mmap_mode="r"),
+                                  np.load(os.path.join(path, f"letter_sets_{length}.npy"), mmap_mode="r"))
+    with np.load(os.path.join(path, "ngrams.npz")) as ngrams:
+        ngram_stats = tuple(ngrams[name] for name in NGRAM_NAMES)
+    return word_index, ngram_stats
+
+
+def load_corpus(file_names: list, cache_dir="corpus/cache") -> tuple:
+    """
+    Load the word index and n-gram statistics for a corpus, rebuilding them only when its files change.
+
+    Args:
+        file_names (list): Paths of the corpus files.
+        cache_dir (str): Directory holding persisted indexes, one subdirectory per corpus digest.
+
+    Returns:
+        tuple: (word_index, ngram_stats) as returned by load_index.
+    """
+    path = os.path.join(cache_dir, corpus_digest(file_names))
+    if not os.path.isdir(path):  # persist_index only ever moves complete indexes into place
+        words = []
+        for file_name in file_names:
+            words += read_words(file_name)
+        if not words:
+            raise RuntimeError("No words available?!")
+        persist_index(words, path)
+    return load_index(path)
+
+
 # # # # # # # # # # # # # # # # # # #  Entropy + frequency strategy  # # # # # # # # # # # # # # # # # #
 
-def single_letter_freq_score(candidates: list, guessed: list):
+def single_letter_freq_score(cand_letter_sets: np.ndarray, guessed_mask: int) -> np.ndarray:
     """
         Compute frequency score for each letter in candidate words not yet guessed.
 
         Args:
-            candidates (list): List of candidate words.
-            guessed (list): Letters already guessed.
+            cand_letter_sets (np.ndarray): Letter-set masks of the candidate words.
+            guessed_mask (int): Bitmask of letters already guessed.
 
         Returns:
-            Counter: Frequency of each letter across candidates.
+            np.ndarray: Number of candidates containing each letter (index 0 = 'a'), 0 for guessed letters.
         """
-    counter = Counter()
-    for word in candidates:
-        for letter in set(word):
-            if letter not in guessed:
-                counter[letter] += 1
-    return counter
+    freqs = np.zeros(26)
+    for b in range(26):
+        if guessed_mask & (1 << b):
+            continue
+        freqs[b] = np.count_nonzero(cand_letter_sets & np.uint32(1 << b))
+    return freqs
+
 
+PARALLEL_MIN_CANDIDATES = 200  # below this, thread start-up costs more than the entropy pass
 
-def entropy_score(candidates: list, guessed: list):
+
+def threadsafe_layer_available() -> bool:
     """
-    Compute entropy (information gain) for each unguessed letter.
+    Check whether Numba can use its TBB threading layer, the only one that is both threadsafe and fork-safe.
 
-    Args:
-        candidates (list): List of candidate words.
-        guessed (list): Letters already guessed.
+    Returns:
+        bool: True if a compatible TBB library can be loaded.
+    """
+    try:
+        from numba.np.ufunc.parallel import _check_tbb_version_compatible
+        _check_tbb_version_compatible()
+        from numba.np.ufunc import tbbpool  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# entropy_kernel_parallel is called from concurrent request threads (Flask's threaded server) and from
+# processes forked after startup (gunicorn --preload). Numba's fallback workqueue layer aborts the process
+# on concurrent calls and GNU OpenMP aborts after fork, so the parallel kernel only runs on TBB.
+PARALLEL_KERNEL = threadsafe_layer_available()
+if PARALLEL_KERNEL:
+    config.THREADING_LAYER = "safe"
+
+
+@njit(cache=True, nogil=True)
+def entropy_table(n):
+    """
+    Entropy term -(k/n) * log2(k/n) of a partition holding k of n candidates, for every k in 0..n.
+    """
+    ent_tbl = np.zeros(n + 1)
+    for k in range(1, n + 1):
+        p = k / n
+        ent_tbl[k] = -p * np.log2(p)
+    return ent_tbl
+
+
+@njit(cache=True, nogil=True)
+def letter_entropy(mat, c, masks, counts, ent_tbl):
+    """
+    Entropy of the position-mask partition that letter code c induces over a candidate matrix,
+    and the number of candidates containing the letter (the words with a non-zero mask).
+
+    Each word's positions holding the letter are packed into an int64 mask, so rows must be
+    shorter than 64 letters. Partitions are counted in the zeroed counts table when it can hold
+    every mask (words up to 16 letters) and by sorting the masks otherwise. A partition of k words
+    adds ent_tbl[k] (see entropy_table).
+    """
+    n, length = mat.shape
+    present = 0
+    for w in range(n):
+        m = 0
+        for i in range(length):
+            if mat[w, i] == c:
+                m |= 1 << i
+        masks[w] = m
+        if m:
+            present += 1
+
+    ent = 0.0
+    if counts.shape[0] > 1:
+        for w in range(n):
+            counts[masks[w]] += 1
+        for w in range(n):
+            k = counts[masks[w]]
+            if k:
+                ent += ent_tbl[k]
+                counts[masks[w]] = 0  # count each partition once and leave the table zeroed
+    else:
+        masks.sort()
+        run = 1
+        for w in range(1, n + 1):
+            if w < n and masks[w] == masks[w - 1]:
+                run += 1
+            else:
+                ent += ent_tbl[run]
+                run = 1
+    return ent, present
+
+
+@njit(cache=True, nogil=True)
+def entropy_kernel(mat, guessed_mask):
+    """
+    Entropy and frequency for each unguessed letter over a candidate matrix, one letter after another.
+    """
+    n, length = mat.shape
+    scores = np.zeros(26)
+    freqs = np.zeros(26)
+    masks = np.empty(n, dtype=np.int64)
+    counts = np.zeros((1 << length) if length <= 16 else 1, dtype=np.int32)
+    ent_tbl = entropy_table(n)
+    for l in range(26):
+        if not guessed_mask & (1 << l):
+            scores[l], freqs[l] = letter_entropy(mat, l + 97, masks, counts, ent_tbl)
+    return scores, freqs
+
+
+@njit(cache=True, nogil=True, parallel=True)
+def entropy_kernel_parallel(mat, guessed_mask):
+    """
+    Entropy and frequency for each unguessed letter over a candidate matrix, letters spread across threads.
+    """
+    n, length = mat.shape
+    scores = np.zeros(26)
+    freqs = np.zeros(26)
+    ent_tbl = entropy_table(n)
+    for l in prange(26):
+        if not guessed_mask & (1 << l):
+            # every letter gets its own scratch buffers
+            masks = np.empty(n, dtype=np.int64)
+            counts = np.zeros((1 << length) if length <= 16 else 1, dtype=np.int32)
+            scores[l], freqs[l] = letter_entropy(mat, l + 97, masks, counts, ent_tbl)
+    return scores, freqs
+
+
+def kernels_source_hash() -> int:
+    """
+    Hash the source of the kernels built ahead of time by hangman_kernels_compile.py, including the
+    kernels they call, so a build made from older sources can be told apart from a current one.
 
     Returns:
-        dict: Entropy score for each unguessed letter.
+        int: 63-bit hash of the kernel sources.
     """
+    kernels = (count_ngrams, letter_set_masks, entropy_table, letter_entropy, entropy_kernel)
+    source = "".join(inspect.getsource(kernel.py_func) for kernel in kernels)
+    return int.from_bytes(hashlib.sha1(source.encode()).digest()[:8], "little") >> 1
+
+
+# Prefer the ahead-of-time build of the kernels (see hangman_kernels_compile.py) when it exists, so
+# serving processes do no JIT compilation. Threads need JIT, so entropy_kernel_parallel always stays JIT.
+# A build whose kernel sources differ from this file's is ignored, as its kernels may not match the callers.
+try:
+    import hangman_kernels
+except ImportError:
+    hangman_kernels = None
+if hangman_kernels is not None:
+    if getattr(hangman_kernels, "kernels_version", lambda: None)() == kernels_source_hash():
+        count_ngrams = hangman_kernels.count_ngrams
+        entropy_kernel = hangman_kernels.entropy_kernel
+        letter_set_masks = hangman_kernels.letter_set_masks
+    else:
+        warnings.warn("hangman_kernels was built from other kernel sources and is ignored, falling back to "
+                      "JIT; rebuild it with `python hangman_kernels_compile.py`")
 
-    scores = {}
-    alphabet = set("abcdefghijklmnopqrstuvwxyz") - guessed
-    for letter in alphabet:
-        partitions = defaultdict(int)
-        for word in candidates:
-            # partition by mask of positions where `letter` appears
-            mask = tuple(i for i, c in enumerate(word) if c == letter)
-            partitions[mask] += 1
-        total = len(candidates)
-        ent = 0.0
-        for part_count in partitions.values():
-            p = part_count / total
-            ent -= p * math.log2(p)
-        scores[letter] = ent
-    return scores
 
+def entropy_freq_score(cand_matrix: np.ndarray, cand_letter_sets: np.ndarray, guessed_mask: int) -> tuple:
+    """
+    Compute entropy (information gain) and frequency score for each unguessed letter.
 
-def entropy_guess(candidates, guessed, weight_freq=0.5):
+    Args:
+        cand_matrix (np.ndarray): (N, L) uint8 matrix of candidate words.
+        cand_letter_sets (np.ndarray): Letter-set masks of the candidate words.
+        guessed_mask (int): Bitmask of letters already guessed.
+
+    Returns:
+        tuple: (entropy, freqs) per letter (index 0 = 'a'), 0 for guessed letters. Both come out of
+               the same pass over the candidates.
+    """
+    if cand_matrix.shape[1] < 64:
+        if len(cand_matrix) < PARALLEL_MIN_CANDIDATES or not PARALLEL_KERNEL:
+            return entropy_kernel(cand_matrix, guessed_mask)
+        return entropy_kernel_parallel(cand_matrix, guessed_mask)
+
+    # position masks no longer fit in an int64, partition on the boolean rows instead
+    scores = np.zeros(26)
+    for l in range(26):
+        if guessed_mask & (1 << l):
+            continue
+        _, counts = np.unique(cand_matrix == l + 97, axis=0, return_counts=True)
+        p = counts / len(cand_matrix)
+        scores[l] = -(p * np.log2(p)).sum()
+    return scores, single_letter_freq_score(cand_letter_sets, guessed_mask)
+
+
+def entropy_guess(cand_matrix, cand_letter_sets, guessed_mask: int, weight_freq=0.5):
     """
     Combine entropy and letter frequency to choose next guess.
 
     Args:
-        candidates (list): Candidate words.
-        guessed (list): Already guessed letters.
+        cand_matrix (np.ndarray): (N, L) uint8 matrix of candidate words.
+        cand_letter_sets (np.ndarray): Letter-set masks of the candidate words.
+        guessed_mask (int): Bitmask of letters already guessed.
         weight_freq (float): Weight for frequency contribution.
 
     Returns:
-        str: Letter with the highest combined score.
+        int: Code (0 = 'a') of the letter with the highest combined score.
     """
-    if not candidates:
+    if not len(cand_matrix) or guessed_mask == ALL_LETTERS:
         return None
-    ent_scores = entropy_score(candidates, guessed)
-    freq_scores = single_letter_freq_score(candidates, guessed)
-
-    combined = {}
-    for letter in ent_scores:
-        combined[letter] = ent_scores[letter] + weight_freq * freq_scores.get(letter, 0)
+    entropy, freqs = entropy_freq_score(cand_matrix, cand_letter_sets, guessed_mask)
+    combined = entropy + weight_freq * freqs
+    combined[~unguessed(guessed_mask)] = -np.inf
 
     # choose the letter with the highest combined score
-    return max(combined, key=combined.get)
+    return int(np.argmax(combined))
+
+
+def warm_up_kernels(parallel: bool = True):
+    """
+    Compile the Numba kernels on a dummy input so JIT cost is paid at startup, not on the first guess.
+
+    Args:
+        parallel (bool): Also warm up entropy_kernel_parallel. Even compiling it starts Numba's thread
+            pool, and a process that forks afterwards is not safe (GNU OpenMP aborts the children, TBB
+            can hang the parent on exit), so processes that fork workers must pass False.
+    """
+    dummy = np.full((1, 5), 97, dtype=np.uint8)
+    entropy_kernel(dummy, 0)
+    if parallel and PARALLEL_KERNEL:
+        entropy_kernel_parallel(dummy, 0)
 
 
 # # # # # # # # # # # # # # # # # # Bayesian strategy using uni/bi/tri-grams  # # # # # # # # # # # # # # # # # #
 
-def bayesian_guess(pattern, guessed, unigram_probs, bigram, trigram, bigram_next_sum,
-                   bigram_prev_sum, trigram_lr_sum,
-                   alpha=1.0):
+def bayesian_guess(pattern, guessed_mask: int, log_prior, log_pLX, log_pRX, log_pLXR):
     """
     Bayesian guess using n-gram statistics with Laplace smoothing.
 
     Args:
         pattern (list): Current word pattern.
-        guessed (set): Letters already guessed.
-        unigram_probs, bigram, trigram: N-gram statistics.
-        bigram_next_sum, bigram_prev_sum, trigram_lr_sum: Precomputed sums.
-        alpha (float): Laplace smoothing parameter.
+        guessed_mask (int): Bitmask of letters already guessed.
+        log_prior, log_pLX, log_pRX, log_pLXR: Log probability tables from build_bayes_tables.
 
     Returns:
-        str: Letter with highest posterior score.
+        int: Code (0 = 'a') of the letter with highest posterior score.
     """
-    V = 26  # alphabet size for smoothing
-    letters = set("abcdefghijklmnopqrstuvwxyz") - guessed
-    if not letters:
+    if guessed_mask == ALL_LETTERS or "_" not in pattern:
         return None
+    # blanks and any character outside a-z have no table row, so they count as unknown neighbours
+    codes = [ord(p) - 97 if "a" <= p <= "z" else -1 for p in pattern]
 
-    scores = defaultdict(float)
-
+    # one preallocated score per letter, accumulated row by row; for word-length patterns this beats
+    # gathering a (blanks, 26) block of table rows, which costs more in temporaries than it saves
+    scores = np.zeros(26)
+    last = len(codes) - 1
     for pos, p in enumerate(pattern):
         if p != "_":
             continue
-        left = pattern[pos - 1] if pos > 0 else None
-        right = pattern[pos + 1] if pos < len(pattern) - 1 else None
-
-        for X in letters:
-            prior = unigram_probs.get(X, 1e-12)
-            likelihood = 1.0
-
-            # P(left | X) ~ count(left,X) / sum_a count(a,X)
-            if left and left != "_":
-                numer = bigram.get((left, X), 0) + alpha
-                denom = bigram_next_sum.get(left, 0) + alpha * V
-                likelihood *= numer / denom
-
-            # P(right | X) ~ count(X,right) / sum_b count(X,b)
-            if right and right != "_":
-                numer = bigram.get((X, right), 0) + alpha
-                denom = bigram_next_sum.get(X, 0) + alpha * V
-                likelihood *= numer / denom
-
-            # trigram factor (how likely is X to appear between left and right)
-            if left and right and left != "_" and right != "_":
-                numer = trigram.get((left, X, right), 0) + alpha
-                denom = trigram_lr_sum.get((left, right), 0) + alpha * V
-                likelihood *= numer / denom
-
-            score = prior * likelihood
-            scores[X] += score
-
-    if not scores:
-        return None
-    return max(scores, key=scores.get)
+        left = codes[pos - 1] if pos > 0 else -1
+        right = codes[pos + 1] if pos < last else -1
+
+        log_score = log_prior
+        if left != -1:
+            log_score = log_score + log_pLX[left]
+        if right != -1:
+            log_score = log_score + log_pRX[right]
+        if left != -1 and right != -1:
+            log_score = log_score + log_pLXR[left, right]
+        scores += np.exp(log_score)  # prior * likelihood
+
+    scores[~unguessed(guessed_mask)] = -np.inf
+    return int(np.argmax(scores))
 
 
 # # # # # # # # # # # # # # # # # # Unigram fallback  # # # # # # # # # # # # # # # # # #
 
-def fallback_unigram(unigram_probs, guessed: list):
+def fallback_unigram(unigram_probs, guessed_mask: int):
     """
     Fallback guess based on unigram frequencies.
 
     Args:
-        unigram_probs (dict): Unigram probabilities.
-        guessed (list): Letters already guessed.
+        unigram_probs (np.ndarray): Unigram probabilities indexed by letter (0 = 'a').
+        guessed_mask (int): Bitmask of letters already guessed.
 
     Returns:
-        str: Most frequent unguessed letter.
+        int: Code (0 = 'a') of the most frequent unguessed letter.
     """
-    candidates = [(p, i) for i, p in unigram_probs.items() if i not in guessed]
-    if candidates:
-        return max(candidates)[1]
+    probs = np.where(unguessed(guessed_mask), unigram_probs, 0.0)
+    if probs.max() > 0:
+        return int(np.argmax(probs))
     # last resort: any unguessed letter
-    remaining = [i for i in "abcdefghijklmnopqrstuvwxyz" if i not in guessed]
-    return random.choice(remaining) if remaining else None
+    return random_guess(guessed_mask)
 
 
 # # # # # # # # # # # # # # # # # # Brute Force # # # # # # # # # # # # # # # # # #
 
-def random_guess(guessed: list):
+def random_guess(guessed_mask: int):
     """
     Random guess from unguessed letters.
 
     Args:
-        guessed (list): Letters already guessed.
+        guessed_mask (int): Bitmask of letters already guessed.
 
     Returns:
-        str: Random unguessed letter.
+        int: Code (0 = 'a') of a random unguessed letter.
     """
-    remaining = [i for i in "abcdefghijklmnopqrstuvwxyz" if i not in guessed]
-    return random.choice(remaining) if remaining else None
+    remaining = np.flatnonzero(unguessed(guessed_mask))
+    return int(random.choice(remaining)) if len(remaining) else None
 
 
 # # # # # # # # # # # # # # # # # # Game Loop with Strategy Config # # # # # # # # # # # # # # # # # #
 
-def play_hangman(secret_word: str, corpus_words: list, max_attempts=6, strategy="entropy", weight_freq=0.5):
+def play_hangman(secret_word: str, word_index: dict, max_attempts=6, strategy="entropy", weight_freq=0.5):
     """
         Play a single game of Hangman with different strategies.
 
         Args:
             secret_word (str): Word to guess.
-            corpus_words (list): List of valid words for candidate filtering.
+            word_index (dict): Length-bucketed word index used for candidate filtering.
             max_attempts (int): Maximum incorrect guesses allowed.
             strategy (str): Strategy to use ("entropy", "bayesian", "unigram", "random", "combo").
             weight_freq (float): Weight for frequency in entropy-based strategies.
@@ -268,55 +730,59 @@ def play_hangman(secret_word: str, corpus_words: list, max_attempts=6, strategy=
             tuple: ("Win"/"Loss", remaining_attempts)
         """
     secret_word = secret_word.lower()
-    word_list = corpus_words
 
-    guessed = set()
+    guessed_mask = 0
     wrong_guesses = set()
     pattern = ["_" for _ in secret_word]
     attempts_left = max_attempts
+    keep = None
 
     while attempts_left > 0 and "_" in pattern:
-        candidates = filter_candidates(word_list, pattern, wrong_guesses)
-        guess = None
-        if strategy == "entropy":
-            if candidates:
-                guess = entropy_guess(candidates, guessed, weight_freq=weight_freq)
-            else:
-                guess = fallback_unigram(unigram_probs, guessed)
+        # deterministic strategies reach the same states over and over across games
+        state = guess_state(pattern, guessed_mask, strategy, weight_freq)
+        guess = lookup_guess(state) if strategy != "random" else None
+        if guess is None:
+            cand_matrix, cand_letter_sets, keep = filter_candidates(word_index, pattern, wrong_guesses, keep)
+            if strategy == "entropy":
+                if len(cand_matrix):
+                    guess = entropy_guess(cand_matrix, cand_letter_sets, guessed_mask, weight_freq=weight_freq)
+                else:
+                    guess = fallback_unigram(unigram_probs, guessed_mask)
+
+            elif strategy == "bayesian":
+                # bayesian uses pattern+ngram stats directly (works even when candidates exist)
+                guess = bayesian_guess(pattern, guessed_mask, log_prior, log_pLX, log_pRX, log_pLXR)
+                if guess is None:
+                    guess = fallback_unigram(unigram_probs, guessed_mask)
 
-        elif strategy == "bayesian":
-            # bayesian uses pattern+ngram stats directly (works even when candidates exist)
-            guess = bayesian_guess(pattern, guessed, unigram_probs, bigram, trigram, bigram_next_sum, bigram_prev_sum,
-                                   trigram_lr_sum)
-            if guess is None:
-                guess = fallback_unigram(unigram_probs, guessed)
+            elif strategy == "random":
+                guess = random_guess(guessed_mask)
 
-        elif strategy == "random":
-            guess = random_guess(guessed)
+            elif strategy == "unigram":
+                guess = fallback_unigram(unigram_probs, guessed_mask)
 
-        elif strategy == "unigram":
-            guess = fallback_unigram(unigram_probs, guessed)
+            elif strategy == "combo":
+                if len(cand_matrix):
+                    guess = entropy_guess(cand_matrix, cand_letter_sets, guessed_mask, weight_freq=weight_freq)
+                else:
+                    guess = bayesian_guess(pattern, guessed_mask, log_prior, log_pLX, log_pRX, log_pLXR)
+                    if guess is None:
+                        guess = fallback_unigram(unigram_probs, guessed_mask)
 
-        elif strategy == "combo":
-            if candidates:
-                guess = entropy_guess(candidates, guessed, weight_freq=weight_freq)
             else:
-                guess = bayesian_guess(pattern, guessed, unigram_probs, bigram, trigram,
-                                       bigram_next_sum, bigram_prev_sum, trigram_lr_sum)
-                if guess is None:
-                    guess = fallback_unigram(unigram_probs, guessed)
+                raise ValueError(f"Unknown strategy: {strategy}")
 
-        else:
-            raise ValueError(f"Unknown strategy: {strategy}")
+            if strategy != "random":
+                store_guess(state, guess)
 
-        if not guess:
+        if guess is None:
             # should not normally happen, but handle defensively
-            remaining = [l for l in "abcdefghijklmnopqrstuvwxyz" if l not in guessed]
-            if not remaining:
+            guess = random_guess(guessed_mask)
+            if guess is None:
                 break
-            guess = random.choice(remaining)
 
-        guessed.add(guess)
+        guessed_mask |= 1 << guess
+        guess = chr(97 + guess)
 
         if guess in secret_word:
             for i, c in enumerate(secret_word):
@@ -349,23 +815,21 @@ def data_analysis(json_filename: str, strat_names: list):
     """
     with open(json_filename, "r") as f:
         stats = json.load(f)
-    flat_data = {}
-    for l1_key, l2_dict in stats.items():
-        for l2_key, l3_dict in l2_dict.items():
-            if l2_key not in flat_data.keys():
-                flat_data[l2_key] = {}
-            flat_data[l2_key].update({l1_key + k: v for k, v in l3_dict.items()})
-
-    # Convert to DataFrame
-    df = pd.DataFrame.from_dict(flat_data, orient="index")
+    secrets = set()
+    for results in stats.values():
+        secrets.update(results.keys())
+
     for strat in strat_names:
-        win_rate = (df[strat + "status"] == "Win").sum() / len(df)
+        results = stats[strat].values()
+        wins = [r["status"] == "Win" for r in results]
+        attempts = [r["attempts_left"] for r in results]
 
-        mask = df[strat + "status"] == "Win"
-        mean_attempts = pd.to_numeric(df.loc[mask, strat + "attempts_left"], errors="coerce").mean()
+        win_rate = sum(wins) / len(secrets)
+        win_attempts = [a for w, a in zip(wins, attempts) if w]
+        mean_attempts = sum(win_attempts) / len(win_attempts) if win_attempts else float("nan")
 
-        # total_time = pd.to_numeric(df[strat + 'time'], errors="coerce").sum()
-        # total_tries = 6 * len(df) - pd.to_numeric(df[strat + 'attempts_left'], errors="coerce").sum()
+        # total_time = sum(r["time"] for r in results)
+        # total_tries = 6 * len(secrets) - sum(attempts)
         # avg_time = total_time / total_tries
 
         print(f"{strat.upper()} -- Win rate: {win_rate:.2f} | "
@@ -393,6 +857,10 @@ if __name__ == "__main__":
         # Build n-gram stats for Bayesian strategy
 
         unigram_probs, bigram, trigram, bigram_next_sum, bigram_prev_sum, trigram_lr_sum = build_ngram_stats(words)
+        log_prior, log_pLX, log_pRX, log_pLXR = build_bayes_tables(unigram_probs, bigram, trigram,
+                                                                   bigram_next_sum, trigram_lr_sum)
+        word_index = build_word_index(words)
+        warm_up_kernels()
 
         # Run Hangman simulations on each secret word list
         for test_file_name in test_file_names:
@@ -400,7 +868,7 @@ if __name__ == "__main__":
             for secret in secret_list[:secret_count]:
                 for strategy in STRATEGIES.keys():
                     start = time.time()  # record start time
-                    status, attempts_left = play_hangman(secret, corpus_words=words, strategy=strategy)
+                    status, attempts_left = play_hangman(secret, word_index=word_index, strategy=strategy)
                     end = time.time()
                     STRATEGIES[strategy][secret] = {"status": status, "attempts_left": attempts_left,
                                                     "time": end - start}